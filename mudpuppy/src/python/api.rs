@@ -165,15 +165,25 @@ impl Session {
         })
     }
 
+    #[pyo3(signature = (event_type, awaitable, *, option = None, package = None))]
     fn add_event_handler(
         &self,
         py: Python<'_>,
         event_type: EventType,
         awaitable: Py<PyAny>,
+        option: Option<u8>,
+        package: Option<String>,
     ) -> Result {
         dispatch_command(
             py,
-            SessionCommand::AddEventHandler(Handler::new(py, event_type, self.clone(), awaitable)?),
+            SessionCommand::AddEventHandler(Handler::new(
+                py,
+                event_type,
+                self.clone(),
+                awaitable,
+                option,
+                package,
+            )?),
         )
     }
 
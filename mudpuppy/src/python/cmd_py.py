@@ -14,7 +14,7 @@ import history
 # TODO(XXX): hacky. Also doesn't preserve globals() between invocations like desired to make eval() meaningful.
 @command("py")
 async def run_task(code: str, session: Session):
-    logging.debug(f"setting up globals for {session}")
+    logging.debug("setting up globals for %s", session)
 
     tab = await session.tab()
     eval_globals = globals().copy()
@@ -44,9 +44,7 @@ async def run_task(code: str, session: Session):
         }
     )
 
-    logging.debug(
-        f"pycmd: eval: {code}",
-    )
+    logging.debug("pycmd: eval: %s", code)
     try:
         with contextlib.redirect_stdout(io.StringIO()) as stdout_buff:
             try:
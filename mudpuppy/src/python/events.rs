@@ -104,6 +104,26 @@ pub(crate) enum Event {
     GmcpMessage { package: String, json: String },
 }
 
+impl Event {
+    /// The telnet option an event pertains to, if any.
+    fn telnet_option(&self) -> Option<u8> {
+        match self {
+            Event::TelnetOptionEnabled { option }
+            | Event::TelnetOptionDisabled { option }
+            | Event::TelnetSubnegotiation { option, .. } => Some(*option),
+            _ => None,
+        }
+    }
+
+    /// The GMCP package an event pertains to, if any.
+    fn gmcp_package(&self) -> Option<&str> {
+        match self {
+            Event::GmcpMessage { package, .. } => Some(package.as_str()),
+            _ => None,
+        }
+    }
+}
+
 #[pymethods]
 impl Event {
     pub(crate) fn r#type(&self) -> EventType {
@@ -227,6 +247,10 @@ pub(crate) struct Handler {
     pub(crate) r#type: EventType,
     pub(crate) session: python::Session,
     pub(crate) awaitable: Py<PyAny>,
+    /// When set, only dispatch telnet option events for this option.
+    pub(crate) option: Option<u8>,
+    /// When set, only dispatch GMCP message events for this package.
+    pub(crate) package: Option<String>,
 }
 
 impl Handler {
@@ -235,14 +259,27 @@ impl Handler {
         r#type: EventType,
         session: python::Session,
         awaitable: Py<PyAny>,
+        option: Option<u8>,
+        package: Option<String>,
     ) -> python::Result<Self> {
         require_coroutine(py, r#type.to_string(), &awaitable)?;
         Ok(Handler {
             r#type,
             session,
             awaitable,
+            option,
+            package,
         })
     }
+
+    fn matches(&self, event: &Event) -> bool {
+        self.option
+            .is_none_or(|option| event.telnet_option() == Some(option))
+            && self
+                .package
+                .as_deref()
+                .is_none_or(|package| event.gmcp_package() == Some(package))
+    }
 }
 
 #[derive(Debug)]
@@ -265,7 +302,7 @@ impl Handlers {
             event: &Event,
             futures: &mut FuturesUnordered<PyFuture>,
         ) -> Result<(), Error> {
-            for handler in handlers {
+            for handler in handlers.iter().filter(|handler| handler.matches(event)) {
                 let event = Python::attach(|_| event.clone());
                 let session = handler.session.clone();
                 let future = Python::attach(|py| {
@@ -316,3 +353,85 @@ impl Handlers {
             .push(handler);
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn gmcp(package: &str) -> Event {
+        Event::GmcpMessage {
+            package: package.to_string(),
+            json: "{}".to_string(),
+        }
+    }
+
+    fn handler(r#type: EventType, option: Option<u8>, package: Option<&str>) -> Handler {
+        Python::attach(|py| Handler {
+            r#type,
+            session: python::Session {
+                id: 1,
+                character: "test".to_string(),
+            },
+            awaitable: py.None(),
+            option,
+            package: package.map(str::to_string),
+        })
+    }
+
+    #[test]
+    fn test_event_telnet_option() {
+        assert_eq!(
+            Event::TelnetOptionEnabled { option: 31 }.telnet_option(),
+            Some(31)
+        );
+        assert_eq!(
+            Event::TelnetOptionDisabled { option: 42 }.telnet_option(),
+            Some(42)
+        );
+        assert_eq!(
+            Event::TelnetSubnegotiation {
+                option: 201,
+                data: Vec::new(),
+            }
+            .telnet_option(),
+            Some(201)
+        );
+        assert_eq!(
+            Event::TelnetIacCommand { command: 249 }.telnet_option(),
+            None
+        );
+        assert_eq!(gmcp("Char.Vitals").telnet_option(), None);
+    }
+
+    #[test]
+    fn test_event_gmcp_package() {
+        assert_eq!(
+            gmcp("Comm.Channel.Text").gmcp_package(),
+            Some("Comm.Channel.Text")
+        );
+        assert_eq!(
+            Event::TelnetOptionEnabled { option: 201 }.gmcp_package(),
+            None
+        );
+    }
+
+    #[test]
+    fn test_handler_matches() {
+        Python::initialize();
+
+        let unfiltered = handler(EventType::GmcpMessage, None, None);
+        assert!(unfiltered.matches(&gmcp("Char.Vitals")));
+        assert!(unfiltered.matches(&Event::TelnetOptionEnabled { option: 31 }));
+
+        let by_option = handler(EventType::TelnetOptionEnabled, Some(31), None);
+        assert!(by_option.matches(&Event::TelnetOptionEnabled { option: 31 }));
+        assert!(!by_option.matches(&Event::TelnetOptionEnabled { option: 42 }));
+        assert!(!by_option.matches(&gmcp("Char.Vitals")));
+
+        let by_package = handler(EventType::GmcpMessage, None, Some("Comm.Channel.Text"));
+        assert!(by_package.matches(&gmcp("Comm.Channel.Text")));
+        assert!(!by_package.matches(&gmcp("Comm.Channel")));
+        assert!(!by_package.matches(&gmcp("Char.Vitals")));
+        assert!(!by_package.matches(&Event::TelnetOptionEnabled { option: 201 }));
+    }
+}
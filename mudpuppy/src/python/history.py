@@ -1,4 +1,5 @@
 import logging
+from collections import deque
 from enum import Enum
 from typing import Optional
 
@@ -25,9 +26,11 @@ class Direction(Enum):
 class InputHistory:
     def __init__(self, sesh: Session, input: Input, max_lines: int = 1000):
         self.sesh = sesh
+        self.sesh_id = sesh.id
         self.input = input
         self.max_lines = max_lines
-        self.lines: list[InputLine] = []
+        # Bounded, so the oldest line falls off without shifting the rest.
+        self.lines: deque[InputLine] = deque(maxlen=max_lines)
         self.cursor_pos: Optional[int] = None
         self.partial: Optional[InputLine] = None
 
@@ -38,7 +41,7 @@ class InputHistory:
         self.cursor_pos = None
 
     async def sent_line(self, sesh: Session, ev: Event):
-        if isinstance(ev, Event.InputLine) and sesh.id == self.sesh.id:
+        if isinstance(ev, Event.InputLine) and sesh.id == self.sesh_id:
             self.add(ev.line)
 
     def add(self, line: InputLine):
@@ -52,10 +55,6 @@ class InputHistory:
 
         self.lines.append(line)
 
-        # Trim old lines
-        if len(self.lines) >= self.max_lines:
-            self.lines.pop(0)
-
     async def _navigate_history(self, direction: str):
         if self.input.echo() == EchoState.Password:
             return
@@ -98,9 +97,11 @@ class InputHistory:
         if self.cursor_pos is None:
             return None
 
-        while self.cursor_pos < len(self.lines) - 1:
+        lines = self.lines
+        last = len(lines) - 1
+        while self.cursor_pos < last:
             self.cursor_pos += 1
-            line = self.lines[self.cursor_pos]
+            line = lines[self.cursor_pos]
             if not self._should_skip_line(line, skip_scripted):
                 return line
 
@@ -108,15 +109,16 @@ class InputHistory:
         return None
 
     def prev(self, *, skip_scripted: bool = True) -> Optional[InputLine]:
-        if not self.lines:
+        lines = self.lines
+        if not lines:
             return None
 
         if self.cursor_pos is None:
-            self.cursor_pos = len(self.lines)
+            self.cursor_pos = len(lines)
 
         while self.cursor_pos > 0:
             self.cursor_pos -= 1
-            line = self.lines[self.cursor_pos]
+            line = lines[self.cursor_pos]
             if not self._should_skip_line(line, skip_scripted):
                 return line
 
@@ -14,11 +14,16 @@ SlashCommand = Callable[[str, Session], Awaitable[None]]
 SetupHandler = Callable[[Session], Awaitable[None]]
 Filters = Dict[str, Any]
 
+# Filters that the session checks before an event is dispatched to Python at all.
+_DISPATCH_FILTERS = ("option", "package")
+
+_CAMEL_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
 
 @dataclass
 class Handlers:
-    events: List[Tuple[EventType, Filters, EventHandler]] = field(default_factory=list)
-    shortcuts: List[Tuple[KeyEvent, ShortcutHandler]] = field(default_factory=list)
+    events: List[Tuple[EventType, EventHandler, Filters]] = field(default_factory=list)
+    shortcuts: List[Tuple[KeyEvent, Shortcut]] = field(default_factory=list)
     slash_commands: List[Tuple[str, SlashCommand]] = field(default_factory=list)
     setup: List[SetupHandler] = field(default_factory=list)
 
@@ -33,12 +38,59 @@ def _require_coroutine(callback: Any):
         )
 
 
+def _filtered(
+    event_type: EventType, filters: Filters, handler: EventHandler
+) -> EventHandler:
+    # Specialize the filter check to the shape of the filters so that the
+    # common cases don't pay for a generic loop on every event.
+    if not filters:
+        return handler
+
+    def skipping(property: str, required_value: Any) -> None:
+        logging.debug(
+            "%s handler %s wrapper skipping: event property %s != %s",
+            event_type,
+            handler,
+            property,
+            required_value,
+        )
+
+    if len(filters) == 1:
+        ((property, required_value),) = filters.items()
+
+        async def single_filter_wrapper(s: Session, e: Event) -> None:
+            if getattr(e, property, None) != required_value:
+                skipping(property, required_value)
+                return
+            await handler(s, e)
+
+        return single_filter_wrapper
+
+    filter_items = tuple(filters.items())
+
+    async def wrapper(s: Session, e: Event) -> None:
+        for property, required_value in filter_items:
+            if getattr(e, property, None) != required_value:
+                skipping(property, required_value)
+                return
+        await handler(s, e)
+
+    return wrapper
+
+
 def event(
     event_type: EventType, **filters: Any
 ) -> Callable[[EventHandler], EventHandler]:
+    dispatch_filters = {
+        name: filters.pop(name) for name in _DISPATCH_FILTERS if name in filters
+    }
+
     def decorator(func: EventHandler) -> EventHandler:
         _require_coroutine(func)
-        _modules[func.__module__].events.append((event_type, filters, func))
+        # Wrap once here so every session shares the same filtered handler.
+        _modules[func.__module__].events.append(
+            (event_type, _filtered(event_type, filters, func), dispatch_filters)
+        )
         return func
 
     return decorator
@@ -47,7 +99,10 @@ def event(
 def shortcut(key_event: KeyEvent) -> Callable[[ShortcutHandler], ShortcutHandler]:
     def decorator(func: ShortcutHandler) -> ShortcutHandler:
         _require_coroutine(func)
-        _modules[func.__module__].shortcuts.append((key_event, func))
+        # Shortcuts are immutable, so one instance is shared by every session's tab.
+        _modules[func.__module__].shortcuts.append(
+            (key_event, Shortcut.Python(PythonShortcut(func)))
+        )
         return func
 
     return decorator
@@ -70,33 +125,17 @@ def setup(func: SetupHandler) -> SetupHandler:
 
 async def _new_session(sesh: Session) -> None:
     for module_name, handlers in _modules.items():
-        logging.debug(f"setting up {module_name} session {sesh}")
+        logging.debug("setting up %s session %s", module_name, sesh)
         for setup_handler in handlers.setup:
             await setup_handler(sesh)
 
-        for event_type, filters, handler in handlers.events:
-            # Force early binding by making handler/filters default parameters
-            async def wrapper(
-                s: Session,
-                e: Event,
-                event_type=event_type,
-                handler=handler,
-                filters=filters,
-            ) -> None:
-                for property, required_value in filters.items():
-                    if getattr(e, property, None) != required_value:
-                        logging.debug(
-                            f"{event_type} handler {handler} wrapper skipping: event property {property} != {required_value}"
-                        )
-                        return
-                await handler(s, e)
-
-            sesh.add_event_handler(event_type, wrapper)
+        for event_type, handler, dispatch_filters in handlers.events:
+            sesh.add_event_handler(event_type, handler, **dispatch_filters)
 
         if handlers.shortcuts:
             tab = await sesh.tab()
-            for key_event, handler in handlers.shortcuts:
-                tab.set_shortcut(key_event, Shortcut.Python(PythonShortcut(handler)))
+            for key_event, shortcut_action in handlers.shortcuts:
+                tab.set_shortcut(key_event, shortcut_action)
 
         for name, handler in handlers.slash_commands:
             sesh.add_slash_command(name, handler)
@@ -106,7 +145,7 @@ _generated_decorators = []
 
 for name, event_type in EventType.all().items():
     # Convert PascalCase to snake_case
-    decorator_name = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    decorator_name = _CAMEL_RE.sub("_", name).lower()
 
     def _event_decorator(
         event_type: EventType,
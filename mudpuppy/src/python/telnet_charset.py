@@ -9,7 +9,10 @@ REQUEST = 1
 ACCEPTED = 2
 REJECTED = 3
 
-ACCEPTED_ENCODINGS = [b"UTF-8", b"ASCII", b"US-ASCII"]
+ACCEPTED_ENCODINGS = frozenset([b"UTF-8", b"ASCII", b"US-ASCII"])
+
+_ACCEPTED_PREFIX = bytes([ACCEPTED])
+_REJECTED_BYTES = bytes([REJECTED])
 
 
 logging.debug("module loaded")
@@ -17,25 +20,26 @@ logging.debug("module loaded")
 
 @session_connected()
 async def enable_charset(sesh: Session, _: Event):
-    logging.debug(f"{sesh} requesting telnet charset option")
+    logging.debug("%s requesting telnet charset option", sesh)
     sesh.telnet().request_enable_option(CHARSET_OPTION)
 
 
 @telnet_subnegotiation(option=CHARSET_OPTION)
 async def charset_option(sesh: Session, ev: Event):
     if len(ev.data) < 2 or ev.data[0] != REQUEST:
-        logging.warning(f"received unknown charset request: {ev.data}")
+        logging.warning("received unknown charset request: %s", ev.data)
         return
 
     telnet = sesh.telnet()
     offered = ev.data[2:].split(b" ")
-    logging.debug(f"{sesh} server offered: {offered}")
+    logging.debug("%s server offered: %s", sesh, offered)
     for offer in offered:
-        if offer in ACCEPTED_ENCODINGS:
-            telnet.send_subnegotiation(CHARSET_OPTION, bytes([ACCEPTED]) + offer)
+        # Charset names are case-insensitive, but reply with the server's spelling.
+        if offer.upper() in ACCEPTED_ENCODINGS:
+            telnet.send_subnegotiation(CHARSET_OPTION, _ACCEPTED_PREFIX + offer)
             # TODO(XXX): keep track of the negotiated charset?
-            logging.info(f"{sesh} accepted server's offer - {offer}")
+            logging.info("%s accepted server's offer - %s", sesh, offer)
             return
 
-    telnet.send_subnegotiation(CHARSET_OPTION, bytes([REJECTED]))
-    logging.debug(f"{sesh} rejected server's offer - none compatible")
+    telnet.send_subnegotiation(CHARSET_OPTION, _REJECTED_BYTES)
+    logging.debug("%s rejected server's offer - none compatible", sesh)
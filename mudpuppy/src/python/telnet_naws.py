@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import struct
-from typing import Set
+from typing import Dict, Set, Tuple
 
 from pup import Session, Event
 
@@ -14,33 +15,39 @@ from pup_events import (
 
 NAWS_OPTION = 31
 
+# How long to wait for resizes to settle before telling the server.
+NAWS_DEBOUNCE_SECS = 0.05
+
+_NAWS_PACK = struct.Struct(">HH").pack
+
 logging.debug("module loaded")
-enabled_sessions: Set[Session] = set()
+enabled_sessions: Set[int] = set()
+pending_sizes: Dict[int, Tuple[int, int]] = {}
 
 
 @session_connected()
 async def connected(sesh: Session, _: Event):
-    logging.debug(f"{sesh} requesting telnet NAWS option")
+    logging.debug("%s requesting telnet NAWS option", sesh)
     sesh.telnet().request_enable_option(NAWS_OPTION)
 
 
 @session_disconnected()
 async def disconnected(sesh: Session, _: Event):
-    logging.debug(f"{sesh} disconnected")
-    if sesh in enabled_sessions:
-        enabled_sessions.remove(sesh)
+    logging.debug("%s disconnected", sesh)
+    enabled_sessions.discard(sesh.id)
+    pending_sizes.pop(sesh.id, None)
 
 
 @telnet_option_enabled(option=NAWS_OPTION)
 async def telnet_option_enabled(sesh: Session, _ev: Event):
-    logging.debug(f"{sesh} option enabled")
-    enabled_sessions.add(sesh)
+    logging.debug("%s option enabled", sesh)
+    enabled_sessions.add(sesh.id)
 
 
 @telnet_option_disabled(option=NAWS_OPTION)
 async def telnet_option_disabled(sesh: Session, _ev: Event):
-    logging.debug(f"{sesh} option disabled")
-    enabled_sessions.remove(sesh)
+    logging.debug("%s option disabled", sesh)
+    enabled_sessions.discard(sesh.id)
 
 
 @buffer_resized()
@@ -50,12 +57,23 @@ async def buffer_resized(sesh: Session, ev: Event):
     if ev.name != "MUD Output":
         return
 
-    if sesh not in enabled_sessions:
-        logging.debug(f"{sesh} ignoring resize - NAWS not enabled")
+    if sesh.id not in enabled_sessions:
+        logging.debug("%s ignoring resize - NAWS not enabled", sesh)
+        return
+
+    # Coalesce bursts of resizes (e.g. dragging a window edge) into a single
+    # subnegotiation sent with the most recent size.
+    scheduled = sesh.id in pending_sizes
+    pending_sizes[sesh.id] = (ev.to.width(), ev.to.height())
+    if not scheduled:
+        asyncio.get_running_loop().call_later(NAWS_DEBOUNCE_SECS, send_naws, sesh)
+
+
+def send_naws(sesh: Session):
+    size = pending_sizes.pop(sesh.id, None)
+    if size is None or sesh.id not in enabled_sessions:
         return
 
-    logging.debug(f"{sesh} NAWS updating to {ev.to}")
-    sesh.telnet().send_subnegotiation(
-        NAWS_OPTION,
-        struct.pack(">HH", ev.to.width(), ev.to.height()),
-    )
+    width, height = size
+    logging.debug("%s NAWS updating to %dx%d", sesh, width, height)
+    sesh.telnet().send_subnegotiation(NAWS_OPTION, _NAWS_PACK(width, height))
@@ -36,25 +36,29 @@ async def custom_tab() -> Tab:
     logging.debug("custom_tab called")
     global _tab
     if _tab is not None:
-        logging.debug(f"already have custom tab: {_tab}")
+        logging.debug("already have custom tab: %s", _tab)
         return _tab
 
     # Create a buffer for some static content
     tab_name = "Custom Tab"
     buffer = Buffer(tab_name)
 
-    # Add some initial content to the buffer
-    for line in [
-        "Welcome to the Custom Tab Demo! 🎸",
-        "",
-        "This tab was created dynamically from Python code.",
-        "Pretty rad, right?",
-    ]:
-        buffer.add(OutputItem.mud(MudLine(bytes(line + "\n", "utf-8"))))
+    # Add some initial content to the buffer, all at once.
+    buffer.add_multiple(
+        [
+            OutputItem.mud(MudLine(bytes(line + "\n", "utf-8")))
+            for line in [
+                "Welcome to the Custom Tab Demo! 🎸",
+                "",
+                "This tab was created dynamically from Python code.",
+                "Pretty rad, right?",
+            ]
+        ]
+    )
 
     # Create the custom tab w/ the buffer
     tab = await pup.create_tab(tab_name, buffers=[buffer])
-    logging.info(f"Created custom tab with ID {tab.id}")
+    logging.info("Created custom tab with ID %d", tab.id)
 
     _tab = tab
     return _tab
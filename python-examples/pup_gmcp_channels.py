@@ -1,9 +1,11 @@
+import functools
+import io
 import logging
-import json
+import os
 import re
+import time
 import unicodedata
-from datetime import datetime, timezone
-from typing import Optional, TextIO
+from typing import List, Optional, TextIO
 from pathlib import Path
 
 import pup
@@ -18,8 +20,64 @@ from pup import (
     MudLine,
 )
 
+try:
+    # orjson is faster for the small JSON payloads of GMCP messages, when it's available.
+    from orjson import loads as json_loads  # type: ignore
+except ImportError:
+    from json import loads as json_loads
+
 logging.debug("pup gmcp channel package loaded")
 
+# Buffers take a copy of each OutputItem, so one separator can be shared.
+_SEPARATOR = OutputItem.mud(MudLine(bytes("--------", "utf-8")))
+
+_SLUG_STRIP = re.compile(r"[^\w\s-]")
+_SLUG_COLLAPSE = re.compile(r"[-\s]+")
+
+
+# The same character/MUD names come back on every reconnect.
+@functools.lru_cache(maxsize=256)
+def _slugify(value: str) -> str:
+    value = unicodedata.normalize("NFKC", value)
+    value = _SLUG_STRIP.sub("", value.lower())
+    return _SLUG_COLLAPSE.sub("-", value).strip("-_")
+
+
+def _tail_lines(path: Path, count: int, chunk_size: int = 8192) -> List[bytes]:
+    """
+    Return up to the last `count` lines of `path`, reading backwards from the end
+    of the file rather than loading all of it.
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # Stop once we've seen more than `count` newlines so that the oldest line
+        # we return is complete.
+        while pos > 0 and data.count(b"\n") <= count:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+    # Only "\n" ends a line in the log, unlike bytes.splitlines() which also splits
+    # on "\r" and friends.
+    return io.BytesIO(data).readlines()[-count:]
+
+
+# Channel messages tend to arrive in bursts, so reuse the formatted timestamp
+# until the second ticks over.
+_timestamp_cache = (0, "")
+
+
+def _timestamp() -> str:
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache = (
+            now,
+            time.strftime("%a %b %d %H:%M:%S %Y", time.gmtime(now)),
+        )
+    return _timestamp_cache[1]
+
 
 class GmcpChannelWindow:
     """
@@ -42,38 +100,31 @@ class GmcpChannelWindow:
 
     async def setup(self, sesh: Session, *, with_logfile: bool = False):
         self.sesh = sesh
-        self.logger.debug(f"{self.sesh}: setting up")
+        self.logger.debug("%s: setting up", self.sesh)
 
         # Create a layout section in front of the MUD Output.
         tab = await sesh.tab()
         layout = await tab.layout()
         output_parent = layout.get_parent("MUD Output")
         output_parent.insert_child(0, Constraint.Min(5), Section("Channels"))
-        self.logger.debug(f"{self.sesh}: added channel")
+        self.logger.debug("%s: added channel", self.sesh)
 
         # Create a buffer in the tab to put channel messages into. Using the same name
         # as the layout section we created.
         buffer = Buffer("Channels")
         buffer.line_wrap = True
-        buffer = Buffer("Channels")
-        buffer.line_wrap = True
         buffer.border_bottom = True
         buffer.border_left = True
         buffer.border_right = True
         tab.add_buffer(buffer)
-        self.logger.debug(f"{self.sesh}: added buffer: {buffer}")
+        self.logger.debug("%s: added buffer: %s", self.sesh, buffer)
         self.buffer = buffer
 
         # Set up a log file, if requested.
         if with_logfile:
-            charname = unicodedata.normalize("NFKC", self.sesh.character)
-            charname = re.sub(r"[^\w\s-]", "", charname.lower())
-            charname = re.sub(r"[-\s]+", "-", charname).strip("-_")
-
+            charname = _slugify(self.sesh.character)
             char_info = await self.sesh.character_config()
-            mudname = unicodedata.normalize("NFKC", char_info.mud)
-            mudname = re.sub(r"[^\w\s-]", "", mudname.lower())
-            mudname = re.sub(r"[-\s]+", "-", mudname).strip("-_")
+            mudname = _slugify(char_info.mud)
 
             data_dir = pup.data_dir()
             channel_log_dir = Path(data_dir, "logs/channels")
@@ -82,44 +133,44 @@ class GmcpChannelWindow:
 
             # See if we can read any pre-existing lines to pre-populate the buffer.
             try:
-                logfile = open(logfile_path, "rb")
-                last_lines = logfile.readlines()[-50:]
+                last_lines = _tail_lines(logfile_path, 50)
             except FileNotFoundError:
                 last_lines = []
-            for line in last_lines:
-                buffer.add(OutputItem.mud(MudLine(line)))
-            if len(last_lines) > 0:
-                buffer.add(OutputItem.mud(MudLine(bytes("--------", "utf-8"))))
+            if last_lines:
+                # Add the previous lines, and a separator, to the buffer in one go.
+                items = [OutputItem.mud(MudLine(line)) for line in last_lines]
+                items.append(_SEPARATOR)
+                buffer.add_multiple(items)
 
             # Then open it for appending new messages.
-            self.logfile = open(logfile_path, "a", encoding="utf-8")
+            # Line buffered, so each message reaches the OS as soon as it's written
+            # without an explicit flush().
+            self.logfile = open(logfile_path, "a", buffering=1, encoding="utf-8")
 
         # Set up the GMCP bits.
         gmcp = sesh.gmcp()
         gmcp.register("Comm.Channel")
-        sesh.add_event_handler(EventType.GmcpMessage, self.handle_gmcp)
-        self.logger.debug(f"{self.sesh}: registered for GMCP Comm.Channel")
+        sesh.add_event_handler(
+            EventType.GmcpMessage, self.handle_gmcp, package="Comm.Channel.Text"
+        )
+        self.logger.debug("%s: registered for GMCP Comm.Channel", self.sesh)
 
     async def handle_gmcp(self, _sesh: Session, ev: Event):
         assert isinstance(ev, Event.GmcpMessage)
-        if ev.package != "Comm.Channel.Text":
-            return
 
         if self.sesh is None or self.buffer is None:
-            self.logger.warn("handle_gmcp() called before Setup()")
+            self.logger.warning("handle_gmcp() called before Setup()")
             return
 
-        now = datetime.now(timezone.utc)
-        ts = now.strftime("%a %b %d %H:%M:%S %Y")
+        ts = _timestamp()
 
-        data = json.loads(ev.json)
+        data = json_loads(ev.json)
         channel = data.get("channel_ansi", "unknown")
         text = data.get("text", "").rstrip() + "\n"
         msg = f"{ts} {channel} {text}"
 
         if self.logfile is not None:
             self.logfile.write(msg)
-            self.logfile.flush()
 
-        self.buffer.add(OutputItem.mud(MudLine(bytes(msg, "utf-8"))))
-        self.logger.debug(f"{self.sesh}: added channel msg to buffer")
+        self.buffer.add(OutputItem.mud(MudLine(msg.encode("utf-8"))))
+        self.logger.debug("%s: added channel msg to buffer", self.sesh)
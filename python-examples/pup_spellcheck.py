@@ -1,5 +1,10 @@
+import asyncio
+import functools
 import logging
+import os
 import re
+import threading
+from typing import Any, FrozenSet, Iterator, List, Optional, Tuple
 
 import pup
 from pup import (
@@ -14,60 +19,150 @@ from pup import (
 
 
 ANSI_CODES = {
-    "reset": "0",
-    "bold": "1",
-    "inverted": "7",
-    "black": "30",
-    "red": "31",
-    "green": "32",
-    "yellow": "33",
-    "blue": "34",
-    "magenta": "35",
-    "cyan": "36",
-    "white": "37",
-    "bg_black": "40",
-    "bg_red": "41",
-    "bg_green": "42",
-    "bg_yellow": "43",
-    "bg_blue": "44",
-    "bg_magenta": "45",
-    "bg_cyan": "46",
-    "bg_white": "47",
+    "reset": "\033[0m",
+    "bold": "\033[1m",
+    "inverted": "\033[7m",
+    "black": "\033[30m",
+    "red": "\033[31m",
+    "green": "\033[32m",
+    "yellow": "\033[33m",
+    "blue": "\033[34m",
+    "magenta": "\033[35m",
+    "cyan": "\033[36m",
+    "white": "\033[37m",
+    "bg_black": "\033[40m",
+    "bg_red": "\033[41m",
+    "bg_green": "\033[42m",
+    "bg_yellow": "\033[43m",
+    "bg_blue": "\033[44m",
+    "bg_magenta": "\033[45m",
+    "bg_cyan": "\033[46m",
+    "bg_white": "\033[47m",
 }
 
 
+# Stripped from either end of a word before it's looked up.
+_PUNCTUATION = ".,!?;:'\"`[]{}()\\/<>~!@#$%^&*_-+="
+
+_TOKEN_RE = re.compile(r"<(.*?)>")
+_WORD_RE = re.compile(r"\S+")
+
+
+def _replace_token(match: re.Match) -> str:
+    # Unknown tokens are left as they were.
+    return ANSI_CODES.get(match.group(1), match.group(0))
+
+
 def cformat(text: str) -> str:
-    def ansi_code(token):
-        return f"\033[{ANSI_CODES[token]}m" if token in ANSI_CODES else f"<{token}>"
+    return _TOKEN_RE.sub(_replace_token, text)
+
+
+# The markup applied on every keystroke never changes, so format it once.
+BOLD_RED = cformat("<bold><red>")
+BOLD_GREEN = cformat("<bold><green>")
+RESET = cformat("<reset>")
+
+
+def _plain_stems(dictionary: Any) -> FrozenSet[str]:
+    """
+    Return the dictionary stems that are correct words exactly as written, so they
+    can be accepted without going through Hunspell's affix and compounding rules.
+    """
+    aff = dictionary.aff
+    restricted = {
+        flag
+        for flag in (aff.FORBIDDENWORD, aff.NEEDAFFIX, aff.ONLYINCOMPOUND)
+        if flag
+    }
+    stems = set()
+    excluded = set()
+    for word in dictionary.dic.words:
+        (excluded if word.flags & restricted else stems).add(word.stem)
+    return frozenset(stems - excluded)
+
+
+class _HunspellDictionary:
+    """
+    Adapts cyhunspell's C-backed `Hunspell` to the `lookup()`/`suggest()` interface
+    of a spylls `Dictionary`.
+    """
+
+    def __init__(self, hunspell: Any):
+        self.hunspell = hunspell
+        # Lookups run in worker threads, and a Hunspell handle isn't thread safe.
+        self.lock = threading.Lock()
+
+    def lookup(self, word: str) -> bool:
+        with self.lock:
+            return self.hunspell.spell(word)
+
+    def suggest(self, word: str) -> Iterator[str]:
+        with self.lock:
+            return iter(self.hunspell.suggest(word))
+
+
+# Dictionaries are large and read-only, so sessions share them.
+@functools.lru_cache(maxsize=None)
+def _load_dictionary(name: str) -> Tuple[Any, FrozenSet[str]]:
+    """
+    Load the `name` dictionary, returning it along with its plain stems.
+
+    Prefers cyhunspell when it's installed, falling back to the pure Python spylls.
+    Raises ImportError if neither is available.
+    """
+    try:
+        from hunspell import Hunspell  # type: ignore
+    except ImportError:
+        from spylls.hunspell import Dictionary  # type: ignore
 
-    def replace_tokens(match):
-        token = match.group(1)
-        return ansi_code(token)
+        dictionary = Dictionary.from_files(name)
+        return dictionary, _plain_stems(dictionary)
 
-    pattern = re.compile(r"<(.*?)>")
-    return pattern.sub(replace_tokens, text)
+    # spylls reads `name` + ".aff"/".dic" as a path, so point Hunspell at the same
+    # files rather than its own search path.
+    directory, base = os.path.split(name)
+    hunspell = Hunspell(base, hunspell_data_dir=directory or os.curdir)
+    # Hunspell's own lookups are fast enough not to need the stem shortcut.
+    return _HunspellDictionary(hunspell), frozenset()
 
 
 class Spellchecker:
+    # How long the input has to sit unchanged before it's spellchecked.
+    DEBOUNCE_SECS = 0.05
+    # Input shorter than this is usually MUD shorthand, like a direction, not words.
+    MIN_CHECK_LENGTH = 3
+
     def __init__(self, sesh: Session, dictionary: str = "en_US"):
         self.dictionary_name = dictionary
         self.dictionary = None
+        self.loading: Optional[asyncio.Task] = None
+        self.pending: Optional[asyncio.Task] = None
+        self.last_checked: Optional[str] = None
 
-        try:
-            from spylls.hunspell import Dictionary  # type: ignore
+        sesh.add_event_handler(EventType.InputChanged, self.input_changed)
 
-            self.dictionary = Dictionary.from_files(dictionary)
-            sesh.add_event_handler(EventType.InputChanged, self.input_changed)
+    async def load_dictionary(self, sesh: Session) -> bool:
+        try:
+            # Loading a dictionary can take a while, so keep it off the event loop.
+            self.dictionary, self.stems = await asyncio.to_thread(
+                _load_dictionary, self.dictionary_name
+            )
         except ImportError:
             msg = """
-            'spylls' is not in the PYTHONPATH. Spellchecking will be disabled. Perhaps you need to 'pip install spylls'?
+            Neither 'cyhunspell' nor 'spylls' is in the PYTHONPATH. Spellchecking will be disabled. Perhaps you need to 'pip install cyhunspell' or 'pip install spylls'?
             """
             logging.warning(msg)
             sesh.output(OutputItem.failed_command_result(msg))
-        except FileNotFoundError:
-            msg = f"dictionary '{dictionary}' could not be loaded"  # TODO(XXX): advice.
+            return False
+        except OSError:
+            msg = f"dictionary '{self.dictionary_name}' could not be loaded"  # TODO(XXX): advice.
             logging.warning(msg)
             sesh.output(OutputItem.failed_command_result(msg))
+            return False
+
+        # The same words get looked up over and over as the line is typed.
+        self.lookup = functools.lru_cache(maxsize=4096)(self.dictionary.lookup)
+        return True
 
     async def input_changed(self, sesh: Session, ev: Event):
         assert isinstance(ev, Event.InputChanged)
@@ -76,38 +171,93 @@ class Spellchecker:
         line = ev.line
 
         if input.echo() == EchoState.Password:
+            self.cancel_pending()
             return
 
-        markup = input.markup()
-        markup.clear()
+        # Cursor movement also changes the input, but not the text to check.
+        if line.sent == self.last_checked:
+            return
+
+        # Coalesce a burst of keystrokes into one spellcheck of the final text.
+        self.cancel_pending()
+        self.pending = asyncio.create_task(
+            self.debounced_spellcheck(sesh, line, input.markup())
+        )
+
+    def cancel_pending(self):
+        if self.pending is not None:
+            self.pending.cancel()
+        # A cancelled check may have left the markup half updated, so whatever the
+        # text is next has to be checked again.
+        self.last_checked = None
+
+    async def debounced_spellcheck(
+        self, sesh: Session, line: InputLine, markup: Markup
+    ):
+        await asyncio.sleep(self.DEBOUNCE_SECS)
+
+        # The dictionary is loaded the first time there's input to check. Shielded
+        # so that a newer keystroke cancelling this check doesn't cancel the load.
+        if self.loading is None:
+            self.loading = asyncio.create_task(self.load_dictionary(sesh))
+        if not await asyncio.shield(self.loading):
+            return
 
         await self.spellcheck_input(sesh, line, markup)
+        self.last_checked = line.sent
 
     async def spellcheck_input(self, sesh: Session, line: InputLine, markup: Markup):
         if self.dictionary is None:
             logging.warning("dictionary was None")
             return
-        parts = line.sent.split()
 
-        start = 0
-        for part in parts:
-            end = start + len(part)
+        # Spylls lookups are pure Python, so do them all in one go off the event
+        # loop rather than stalling other handlers while the line is checked.
+        spans: List[List[int]] = []
+        if len(line.sent) >= self.MIN_CHECK_LENGTH:
+            spans = await asyncio.to_thread(self.misspelled_spans, line.sent)
+
+        cmd = None
+        exists = False
+        if line.sent.startswith("/"):
+            # If the first part is a slash command, highlight it specially instead of spellchecking.
+            cmd = line.sent.split(maxsplit=1)[0]
+            exists = await sesh.slash_command_exists(cmd[1:])
+
+        # No awaits from here on, so a newer keystroke can't cancel this check
+        # between clearing the old markup and adding the new.
+        markup.clear()
+        if cmd is not None:
+            self.highlight_cmd(markup, cmd, exists)
+
+        for start, end in spans:
+            markup.add(start, BOLD_RED)
+            markup.add(end, RESET)
+
+    def misspelled_spans(self, text: str) -> List[List[int]]:
+        # Runs of consecutive misspelled words are highlighted as a single span.
+        spans: List[List[int]] = []
+        prev_end = -1
+        for match in _WORD_RE.finditer(text):
+            start, end = match.span()
+            part = match.group()
             # remove leading/trailing punctuation for a dictionary lookup.
-            clean_part = part.strip(".,!?;:'\"`[]{}()\\/<>~!@#$%^&*_-+=").lower()
+            clean_part = part.strip(_PUNCTUATION).lower()
             if start == 0 and part.startswith("/"):
-                # If the first part is a slash command, highlight it specially instead of spellchecking.
-                await self.highlight_cmd(sesh, markup, part)
-            elif not self.dictionary.lookup(clean_part):
-                # logging.debug(f"misspelled word: {clean_part} ({start}, {end})")
-                markup.add(start, cformat("<bold><red>"))
-                markup.add(end, cformat("<reset>"))
+                # Slash commands are highlighted by highlight_cmd().
+                pass
+            elif clean_part not in self.stems and not self.lookup(clean_part):
+                # logging.debug("misspelled word: %s (%s, %s)", clean_part, start, end)
+                if spans and spans[-1][1] == prev_end:
+                    spans[-1][1] = end
+                else:
+                    spans.append([start, end])
 
-            start = end + 1  # Offset by 1 to account for the space between words.
+            prev_end = end
 
-    async def highlight_cmd(self, sesh: Session, markup: Markup, cmd: str):
-        # Check if the command is valid.
-        exists = await sesh.slash_command_exists(cmd[1:])
+        return spans
 
+    def highlight_cmd(self, markup: Markup, cmd: str, exists: bool):
         # Add the appropriate markup to the command part.
-        markup.add(0, cformat("<bold><green>") if exists else cformat("<bold><red>"))
-        markup.add(len(cmd), cformat("<reset>"))
+        markup.add(0, BOLD_GREEN if exists else BOLD_RED)
+        markup.add(len(cmd), RESET)
@@ -1,10 +1,28 @@
+import asyncio
+import functools
 import logging
+import re
+from itertools import islice
+from typing import List, Optional
 
 from mudpuppy import on_event
 from mudpuppy_core import mudpuppy_core, Event, EventType, Input, EchoState
 from cformat import cformat
 from commands import commands  # type: ignore  # TODO(XXX): .pyi for commands
 
+_WORD_RE = re.compile(r"\S+")
+
+# Stripped from either end of a word before it's looked up.
+_PUNCTUATION = ".,!?;:'\"`[]{}()\\/<>~!@#$%^&*_-+="
+
+# The markup applied on every keystroke never changes, so format it once.
+BOLD_RED = cformat("<bold><red>")
+BOLD_GREEN = cformat("<bold><green>")
+RESET = cformat("<reset>")
+
+# Input shorter than this is usually MUD shorthand, like a direction, not words.
+MIN_CHECK_LENGTH = 3
+
 
 @on_event(EventType.KeyPress)
 async def markup_input(event: Event):
@@ -19,16 +37,23 @@ async def markup_input(event: Event):
         annotation = await mudpuppy_core.new_annotation(  # type: ignore # TODO(XXX): stubs for annotations.
             event.id, 0, 0, "", "input_area", rgb=(255, 0, 0)
         )
-        logging.debug(f"annotation with ID {annotation.id}: {annotation}")
+        logging.debug("annotation with ID %s: %s", annotation.id, annotation)
     else:
         annotation.text = ""
 
+    # Load the dictionary before touching the markup, so it isn't left cleared
+    # while we wait.
+    await _load_dictionary()
+
     i = await mudpuppy_core.input(event.id)
     i.clear_markup()
 
     if i.telnet_echo() == EchoState.Password:
         return  # Don't try to spellcheck/highlight masked password entry!
 
+    if len(i.value().sent) < MIN_CHECK_LENGTH:
+        return
+
     spellcheck_input(event.id, i)
 
 
@@ -44,48 +69,95 @@ def highlight_cmd(session_id: int, i: Input, cmd: str):
     valid = commands[session_id].get(cmd[1:])
 
     # Add the appropriate markup to the command part.
-    i.add_markup(0, cformat("<bold><green>") if valid else cformat("<bold><red>"))
-    i.add_markup(len(cmd), cformat("<reset>"))
+    i.add_markup(0, BOLD_GREEN if valid else BOLD_RED)
+    i.add_markup(len(cmd), RESET)
+
+
+# Loading the dictionary is slow, so wait until there's input to check.
+@functools.lru_cache(maxsize=None)
+def _dictionary():
+    try:
+        from spylls.hunspell import Dictionary  # type: ignore
+    except ImportError:
+        logging.warning(
+            "spylls is not in the PYTHONPATH. Spellchecking will be disabled."
+        )
+        logging.warning("perhaps you need to 'pip install spylls'?")
+        return None
 
+    try:
+        # TODO(XXX): support other languages
+        return Dictionary.from_files("en_US")
+    except OSError:
+        # Returned rather than raised, since lru_cache won't remember an exception
+        # and every keypress would try to load the dictionary again.
+        logging.warning("dictionary 'en_US' could not be loaded")
+        return None
+
+
+_loading: Optional[asyncio.Task] = None
 
-def spellcheck_input(session_id: int, i: Input):
-    parts = i.value().sent.split()
 
-    start = 0
-    for part in parts:
-        end = start + len(part)
+async def _load_dictionary():
+    # Keypresses arrive faster than the dictionary loads, so share one load between
+    # them, and run it in a thread to keep the event loop responsive.
+    global _loading
+    if _loading is None:
+        _loading = asyncio.create_task(asyncio.to_thread(_dictionary))
+    return await _loading
+
+
+# The same words get looked up over and over as the line is typed.
+@functools.lru_cache(maxsize=4096)
+def _lookup(word: str) -> bool:
+    return _dictionary().lookup(word)
+
+
+# Suggestions are the slowest part of spellchecking, and the cursor tends to sit
+# on the same misspelled word for a while.
+@functools.lru_cache(maxsize=512)
+def _suggestions(word: str) -> str:
+    return ", ".join(islice(_dictionary().suggest(word), 3))
+
+
+def spellcheck_input(session_id: int, i: Input):
+    dictionary = _dictionary()
+
+    # Runs of consecutive misspelled words are highlighted as a single span.
+    spans: List[List[int]] = []
+    prev_end = -1
+    for match in _WORD_RE.finditer(i.value().sent):
+        start, end = match.span()
+        part = match.group()
         # remove leading/trailing punctuation for a dictionary lookup.
-        clean_part = part.strip(".,!?;:'\"`[]{}()\\/<>~!@#$%^&*_-+=").lower()
+        clean_part = part.strip(_PUNCTUATION).lower()
         if start == 0 and part.startswith("/"):
             # If the first part is a slash command, highlight it specially instead of spellchecking.
             highlight_cmd(session_id, i, part)
-        elif dictionary is not None and not dictionary.lookup(clean_part):
-            # logging.debug(f"misspelled word: {clean_part} ({start}, {end})")
-            i.add_markup(start, cformat("<bold><red>"))
-            i.add_markup(end, cformat("<reset>"))
+        elif dictionary is not None and not _lookup(clean_part):
+            # logging.debug("misspelled word: %s (%s, %s)", clean_part, start, end)
+            if spans and spans[-1][1] == prev_end:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end])
 
             if annotation is not None and i.cursor() == end:
                 logging.debug(
-                    f"bad word: {clean_part} at {start}, {end}. cursor is {i.cursor()}"
+                    "bad word: %s at %s, %s. cursor is %s",
+                    clean_part,
+                    start,
+                    end,
+                    i.cursor(),
                 )
-                from itertools import islice
-
-                suggestions = ", ".join(islice(dictionary.suggest(clean_part), 3))
                 annotation.row = 0
                 annotation.column = i.cursor()
-                annotation.text = suggestions
-
-        start = end + 1  # Offset by 1 to account for the space between words.
+                annotation.text = _suggestions(clean_part)
 
+        prev_end = end
 
-try:
-    from spylls.hunspell import Dictionary  # type: ignore
+    for start, end in spans:
+        i.add_markup(start, BOLD_RED)
+        i.add_markup(end, RESET)
 
-    # TODO(XXX): support other languages
-    dictionary = Dictionary.from_files("en_US")
-except ImportError:
-    logging.warning("spylls is not in the PYTHONPATH. Spellchecking will be disabled.")
-    logging.warning("perhaps you need to 'pip install spylls'?")
-    dictionary = None
 
 annotation = None
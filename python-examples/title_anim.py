@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import logging
 from typing import Optional, List
 
@@ -25,22 +26,20 @@ class TabAnimator:
 
     async def setup(self, sesh: Session):
         self.name = str(sesh)
-        logging.debug(f"TabAnimator: setting up for {self.name}")
+        logging.debug("TabAnimator: setting up for %s", self.name)
         sesh.add_event_handler(EventType.SessionClosed, self.on_close)
 
         self.tab = await sesh.tab()
         asyncio.create_task(self.animate())
 
     async def on_close(self, _sesh: Session, _ev: Event):
-        logging.debug(f"TabAnimator: {self.name} tab closed")
+        logging.debug("TabAnimator: %s tab closed", self.name)
         self.tab = None
 
     async def animate(self):
-        i = 0
-        while True:
+        for frame in itertools.cycle(self.frames):
             if self.tab is None:
-                logging.debug(f"{self.name} tab_title_task ending")
+                logging.debug("%s tab_title_task ending", self.name)
                 break
-            self.tab.set_title(f"{self.frames[i]}")
-            i = (i + 1) % len(self.frames)
+            self.tab.set_title(frame)
             await asyncio.sleep(0.1)
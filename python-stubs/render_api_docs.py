@@ -6,54 +6,81 @@ Output pdoc[0] API documentation for the mudpuppy Python modules.
 [0]: https://pdoc.dev/
 """
 
-import os
+import sys
+import shutil
 import logging
+import tempfile
 from pathlib import Path
 from typing import List, Set
 from pdoc import doc, render, extract
 
 
-def rename_pyi_to_py(directory: Path) -> [List[str], List[Path]]:
+def stage_stubs(stub_directory: Path, staging_directory: Path) -> List[str]:
     """
     pdoc can't work with stub files, but the stubs can stand in as .py
-    files in a pinch as long as we rename them back after.
+    files in a pinch. Copies them into a staging directory under that
+    name, leaving the originals untouched.
 
-    :param directory: location of .pyi stub files (no subdirectories)
-    :return: the list of modules renamed, and the list of renamed files.
+    :param stub_directory: location of .pyi stub files (no subdirectories)
+    :param staging_directory: the directory to copy the stubs into.
+    :return: the list of modules staged.
     """
-    renamed_files: List[Path] = []
     base_names: List[str] = []
 
-    for file in directory.iterdir():
+    for file in stub_directory.iterdir():
         if file.suffix == ".pyi" and file.is_file():
-            py_file = file.with_suffix(".py")
+            shutil.copyfile(file, staging_directory / f"{file.stem}.py")
             base_names.append(file.stem)
-            os.rename(file, py_file)
-            renamed_files.append(py_file)
 
-    return base_names, renamed_files
+    return base_names
 
 
-def restore_files(renamed_files: List[Path]) -> None:
+def up_to_date(sources: List[Path], manifest: Path, expected: Set[str]) -> bool:
     """
-    Restores the .pyi files from the .py files we renamed to generate docs.
+    Checks whether the last render finished, wrote every `expected` output, and
+    everything it wrote still exists and is newer than every source.
 
-    :param renamed_files: list of files that were renamed by `rename_pyi_to_py`
+    Each page links to the other modules, so any changed source means all of
+    the outputs need rendering again. Delete the outputs to force a rebuild.
+
+    :param sources: the stub files, templates, and anything else the docs depend on.
+    :param manifest: the list of outputs written by the last successful render.
+    :param expected: outputs that must be in the manifest, relative to its directory.
+    :return: True if rendering can be skipped.
+    """
+    try:
+        names = manifest.read_text(encoding="utf-8").splitlines()
+        outputs = [manifest, *(manifest.parent / name for name in names)]
+        oldest_output = min(path.stat().st_mtime for path in outputs)
+    except FileNotFoundError:
+        return False
+    if not expected.issubset(names):
+        return False
+    return all(path.stat().st_mtime <= oldest_output for path in sources)
+
+
+def write_output(path: Path, content: str) -> None:
     """
-    for file in renamed_files:
-        original_file = file.with_suffix(".pyi")
-        os.rename(file, original_file)
+    Writes rendered output as UTF-8 text, without translating newlines, so the
+    output is identical on every platform.
+
+    :param path: the file to write.
+    :param content: the rendered output.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
 
 
 def render_docs(
     *, output_directory: Path, template_directory: Path, modules: Set[str]
-) -> None:
+) -> List[Path]:
     """
-    Uses the list of renamed stub files to generate API documentation into the web dir.
+    Uses the list of staged stub files to generate API documentation into the web dir.
 
     :param output_directory: the directory to write the docs to.
     :param template_directory: the directory containing the pdoc templates.
     :param modules: the list of stub modules to write docs for.
+    :return: the files written.
     """
     render.configure(
         docformat="markdown",
@@ -61,8 +88,9 @@ def render_docs(
         show_source=False,
     )
 
-    logging.info(f"rendering to {output_directory}")
+    logging.info("rendering to %s", output_directory)
 
+    written: List[Path] = []
     all_modules = {}
     for module_name in extract.walk_specs(modules):
         all_modules[module_name] = doc.Module.from_name(module_name)
@@ -72,15 +100,20 @@ def render_docs(
         out = render.html_module(module, all_modules)
         outfile = output_directory / f"{module.fullname.replace('.', '/')}.html"
         outfile.parent.mkdir(parents=True, exist_ok=True)
-        outfile.write_bytes(out.encode())
+        write_output(outfile, out)
+        written.append(outfile)
 
     index = render.html_index(all_modules)
     if index:
-        (output_directory / "index.html").write_bytes(index.encode())
+        write_output(output_directory / "index.html", index)
+        written.append(output_directory / "index.html")
 
     search = render.search_index(all_modules)
     if search:
-        (output_directory / "search.js").write_bytes(search.encode())
+        write_output(output_directory / "search.js", search)
+        written.append(output_directory / "search.js")
+
+    return written
 
 
 def main() -> None:
@@ -89,24 +122,41 @@ def main() -> None:
     each.
     """
     script_directory = Path(__file__).parent
-    logging.info(f"processing .pyi files in {script_directory}")
-    base_names, renamed_files = rename_pyi_to_py(script_directory)
-    logging.info(f"processing {base_names}")
-    if len(base_names) == 0:
-        print("No stub .pyi files found.")
+    output_directory = script_directory.joinpath("../web/api-docs")
+    template_directory = script_directory.joinpath("../pdoc-templates")
+
+    stub_files = [f for f in script_directory.glob("*.pyi") if f.is_file()]
+    sources = [Path(__file__), *stub_files]
+    sources.extend(f for f in template_directory.rglob("*") if f.is_file())
+    # Only written once a render succeeds, listing the files it produced.
+    manifest = output_directory / ".rendered"
+    expected = {"index.html", *(f"{f.stem}.html" for f in stub_files)}
+    if stub_files and up_to_date(sources, manifest, expected):
+        print("API docs are up to date.")
         return
-    try:
-        output_directory = script_directory.joinpath("../web/api-docs")
-        template_directory = script_directory.joinpath("../pdoc-templates")
-        render_docs(
-            output_directory=output_directory,
-            template_directory=template_directory,
-            modules={"mudpuppy_core", *base_names},
-        )
-    except Exception as e:
-        print(e)
-    finally:
-        restore_files(renamed_files)
+
+    logging.info("processing .pyi files in %s", script_directory)
+    with tempfile.TemporaryDirectory() as staging_directory:
+        base_names = stage_stubs(script_directory, Path(staging_directory))
+        logging.info("processing %s", base_names)
+        if len(base_names) == 0:
+            print("No stub .pyi files found.")
+            return
+        # A render that fails partway must not leave the old manifest vouching for
+        # the outputs.
+        manifest.unlink(missing_ok=True)
+        sys.path.insert(0, staging_directory)
+        try:
+            written = render_docs(
+                output_directory=output_directory,
+                template_directory=template_directory,
+                modules={"mudpuppy_core", *base_names},
+            )
+        finally:
+            sys.path.remove(staging_directory)
+
+    names = [path.relative_to(output_directory).as_posix() for path in written]
+    manifest.write_text("".join(f"{name}\n" for name in names), encoding="utf-8")
 
 
 if __name__ == "__main__":